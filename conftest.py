@@ -0,0 +1,16 @@
+"""
+pytest configuration: make the root-level modules importable from every test, once per session
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# Independent network tests carry distinct xdist_group markers, so
+# `pytest -n auto --dist=loadgroup` runs them side by side
+def pytest_configure(config):
+    """Register pytest-xdist's grouping marker so runs without xdist don't warn about it"""
+    config.addinivalue_line("markers", "xdist_group(name): run tests of the same group on one xdist worker")
@@ -4,7 +4,7 @@ db_helpers.py - Supabase database operations for storing scraped results
 
 import json
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 import streamlit as st
 from supabase import create_client
 
@@ -19,6 +19,16 @@ def get_supabase_client():
     if _sb_client:
         return _sb_client
     
+    # Reuse the client email_verification already created, so the app
+    # holds one Supabase connection pool per process
+    try:
+        from email_verification import sb
+        if sb:
+            _sb_client = sb
+            return _sb_client
+    except Exception:
+        pass
+    
     # Try to import and create client
     try:
         from auth import sb
@@ -77,6 +87,39 @@ def save_scraped_result_new(data: dict, user_id: str = None) -> bool:
     except Exception as e:
         return False
 
+def save_scraped_results_bulk(records: List[Dict], user_id: str = None) -> bool:
+    """Save several scraped results to Supabase in a single insert (new verification system)"""
+    client = get_supabase_client()
+    if not client or not records:
+        return False
+
+    try:
+        if not user_id:
+            user_id = get_verified_user_id()
+
+        # Same row layout that get_all_scraped_results_new() reads back
+        rows = [
+            {
+                "uuid": result["meta"]["uuid"],
+                "scraped_at": result["meta"]["scraped_at"],
+                "subreddit": result["reddit"]["subreddit"],
+                "reddit_url": result["reddit"]["url"],
+                "reddit_title": result["reddit"]["title"],
+                "reddit_id": result["reddit"]["id"],
+                "analysis": json.dumps(result["analysis"]),
+                "solution": json.dumps(result["solution"]),
+                "cursor_playbook": json.dumps(result["cursor_playbook"]),
+                "user_id": user_id
+            }
+            for result in records
+        ]
+
+        # One PostgREST request for the whole batch
+        response = client.table("scraped_results").insert(rows).execute()
+        return bool(response.data)
+    except Exception as e:
+        return False
+
 def get_all_scraped_results_new() -> List[Dict]:
     """Get all scraped results from Supabase (new verification system)"""
     client = get_supabase_client()
@@ -137,6 +180,26 @@ def mark_post_scraped_new(post_id: str):
         # If table doesn't exist, just continue
         pass
 
+def mark_posts_scraped_new(post_ids: List[str]):
+    """Mark several posts as scraped with a single insert (new verification system)"""
+    client = get_supabase_client()
+    if not client or not post_ids:
+        return
+
+    try:
+        # Get user email from new verification system
+        user_id = get_verified_user_id()
+        scraped_at = datetime.utcnow().isoformat()
+
+        rows = [
+            {"post_id": post_id, "scraped_at": scraped_at, "user_id": user_id}
+            for post_id in post_ids
+        ]
+        client.table("scraped_posts").insert(rows).execute()
+    except Exception as e:
+        # If table doesn't exist, just continue
+        pass
+
 def is_post_already_scraped_new(post_id: str) -> bool:
     """Check if a post has already been scraped (new verification system)"""
     client = get_supabase_client()
@@ -152,6 +215,46 @@ def is_post_already_scraped_new(post_id: str) -> bool:
     except Exception as e:
         return False
 
+def get_scraped_post_ids(post_ids: List[str]) -> Set[str]:
+    """Get which of the given post ids the current user has already scraped, in one query (new verification system)"""
+    client = get_supabase_client()
+    if not client or not post_ids:
+        return set()
+
+    try:
+        # Get user email from new verification system
+        user_id = get_verified_user_id()
+
+        response = client.table("scraped_posts").select("post_id").eq("user_id", user_id).in_("post_id", post_ids).execute()
+        return {row["post_id"] for row in response.data}
+    except Exception as e:
+        return set()
+
+def get_daily_usage_new(email: str) -> int:
+    """Get today's scrape count for a verified user from Supabase (new verification system)"""
+    client = get_supabase_client()
+    if not client or not email:
+        return 0
+
+    try:
+        response = client.rpc("get_daily_usage", {"user_email": email}).execute()
+        return response.data or 0
+    except Exception as e:
+        return 0
+
+def increment_daily_usage_new(email: str) -> bool:
+    """Atomically add one to today's scrape count for a verified user (new verification system)"""
+    client = get_supabase_client()
+    if not client or not email:
+        return False
+
+    try:
+        # increment_daily_usage() upserts server-side, so concurrent sessions can't lose a count
+        response = client.rpc("increment_daily_usage", {"user_email": email}).execute()
+        return bool(response.data)
+    except Exception as e:
+        return False
+
 # === LEGACY: Original Authentication System Functions (Kept for Comparison) ===
 
 def save_scraped_result(result: Dict) -> bool:
@@ -5,9 +5,10 @@ Replaces Supabase magic link auth with lightweight email verification
 
 import uuid
 import streamlit as st
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
 from supabase import create_client
+from resend_helpers import send_email, VERIFICATION_EMAIL_TEMPLATE
 
 # Get Supabase client
 try:
@@ -121,9 +122,13 @@ def verify_token(token: str) -> Tuple[bool, Optional[str]]:
         verification = response.data[0]
         email = verification["email"]
         
+        # One timestamp for the expiry check and the verified_users row
+        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
+        
         # Check if expired
         expires_at = datetime.fromisoformat(verification["expires_at"].replace('Z', '+00:00'))
-        if datetime.utcnow().replace(tzinfo=expires_at.tzinfo) > expires_at:
+        if now.replace(tzinfo=expires_at.tzinfo) > expires_at:
             # Token expired, clean it up
             sb.table("pending_verifications").delete().eq("token", token).execute()
             return False, None
@@ -133,8 +138,8 @@ def verify_token(token: str) -> Tuple[bool, Optional[str]]:
             # Insert into verified_users (ignore if already exists)
             verified_data = {
                 "email": email,
-                "verified_at": datetime.utcnow().isoformat(),
-                "last_login": datetime.utcnow().isoformat()
+                "verified_at": now_iso,
+                "last_login": now_iso
             }
             
             sb.table("verified_users").upsert(verified_data, on_conflict="email").execute()
@@ -264,7 +269,6 @@ def send_verification_email(email: str, token: str, app_url: str) -> bool:
     
     # === RESEND EMAIL SERVICE ===
     try:
-        import resend
         import os
         
         # Get API key from environment variable
@@ -275,55 +279,24 @@ def send_verification_email(email: str, token: str, app_url: str) -> bool:
             print(f"🔍 Available env vars: {list(os.environ.keys())}")
             return False
         
-        resend.api_key = resend_api_key
-        
         # For development, use Resend's sandbox domain
         # For production, replace with your verified domain
         from_email = "Acme <onboarding@resend.dev>"  # Resend's sandbox domain
         
-        response = resend.Emails.send({
+        email_id = send_email(resend_api_key, {
             "from": from_email,
             "to": [email],
             "subject": "Verify your email - Reddit SaaS Idea Finder",
-            "html": f"""
-            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                <h2 style="color: #333;">🚀 Welcome to Reddit SaaS Idea Finder!</h2>
-                <p>Thanks for signing up! Click the button below to verify your email address and unlock 15 scrapes per day:</p>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{verification_url}" style="background-color: #007bff; color: white; padding: 14px 30px; text-decoration: none; border-radius: 6px; display: inline-block; font-weight: bold;">
-                        ✅ Verify Email Address
-                    </a>
-                </div>
-                
-                <p style="color: #666; font-size: 14px;">
-                    Or copy and paste this link into your browser:<br>
-                    <a href="{verification_url}" style="color: #007bff;">{verification_url}</a>
-                </p>
-                
-                <div style="background-color: #fff3cd; padding: 15px; border-radius: 6px; margin: 20px 0;">
-                    <p style="margin: 0; color: #856404;">
-                        ⚠️ <strong>Important:</strong> This verification link will expire in 10 minutes.
-                    </p>
-                </div>
-                
-                <p style="color: #666; font-size: 14px;">
-                    If you didn't request this verification, you can safely ignore this email.
-                </p>
-            </div>
-            """
+            "html": VERIFICATION_EMAIL_TEMPLATE.substitute(verification_url=verification_url)
         })
         
-        if response.id:
+        if email_id:
             print(f"✅ Email sent successfully to {email}")
             return True
         else:
             print(f"❌ Failed to send email to {email}")
             return False
             
-    except ImportError:
-        print("❌ Resend not installed. Run: pip install resend")
-        return False
     except Exception as e:
         print(f"❌ Resend error: {e}")
         return False
@@ -2,24 +2,11 @@
 FastAPI Database Helpers for quota management
 """
 
-import os
 from datetime import date, datetime
 from typing import Optional
-from supabase import create_client
 
-# Get Supabase client
-try:
-    import streamlit as st
-    SB_URL = st.secrets["SUPABASE_URL"]
-    SB_KEY = st.secrets["SUPABASE_ANON_KEY"]
-except:
-    SB_URL = os.getenv("SUPABASE_URL")
-    SB_KEY = os.getenv("SUPABASE_ANON_KEY")
-
-if SB_URL and SB_KEY:
-    sb = create_client(SB_URL, SB_KEY)
-else:
-    sb = None
+# Share the verification module's Supabase client instead of opening a second pool
+from fastapi_email_verification import sb
 
 def get_daily_usage(email: Optional[str]) -> int:
     """Get daily usage count for user from Supabase"""
@@ -27,14 +14,9 @@ def get_daily_usage(email: Optional[str]) -> int:
         return 0
     
     try:
-        today = date.today().isoformat()
-        
-        # Query the usage table (you'll need to create this)
-        response = sb.table("daily_usage").select("count").eq("email", email).eq("date", today).execute()
-        
-        if response.data:
-            return response.data[0].get("count", 0)
-        return 0
+        # Same RPC family as the increment, so both use the database's CURRENT_DATE
+        response = sb.rpc("get_daily_usage", {"user_email": email}).execute()
+        return response.data or 0
         
     except Exception as e:
         print(f"Error getting daily usage: {e}")
@@ -46,20 +28,9 @@ def increment_daily_usage(email: Optional[str]) -> bool:
         return False
     
     try:
-        today = date.today().isoformat()
-        
-        # Try to update existing record
-        response = sb.table("daily_usage").update({"count": "count + 1"}).eq("email", email).eq("date", today).execute()
-        
-        if not response.data:
-            # Create new record if none exists
-            response = sb.table("daily_usage").insert({
-                "email": email,
-                "date": today,
-                "count": 1
-            }).execute()
-        
-        return True
+        # Server-side upsert (see supabase_usage_table.sql): one atomic round trip
+        response = sb.rpc("increment_daily_usage", {"user_email": email}).execute()
+        return bool(response.data)
         
     except Exception as e:
         print(f"Error incrementing daily usage: {e}")
@@ -5,9 +5,10 @@ Standalone email verification without Streamlit dependencies
 
 import uuid
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
 from supabase import create_client
+from resend_helpers import send_email, VERIFICATION_EMAIL_TEMPLATE
 
 # Get Supabase client
 SB_URL = os.getenv("SUPABASE_URL")
@@ -80,9 +81,13 @@ def verify_token(token: str) -> Tuple[bool, Optional[str]]:
         verification = response.data[0]
         email = verification["email"]
         
+        # One timestamp for the expiry check and the verified_users row
+        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
+        
         # Check if expired
         expires_at = datetime.fromisoformat(verification["expires_at"].replace('Z', '+00:00'))
-        if datetime.utcnow().replace(tzinfo=expires_at.tzinfo) > expires_at:
+        if now.replace(tzinfo=expires_at.tzinfo) > expires_at:
             # Token expired, clean it up
             sb.table("pending_verifications").delete().eq("token", token).execute()
             return False, None
@@ -92,8 +97,8 @@ def verify_token(token: str) -> Tuple[bool, Optional[str]]:
             # Insert into verified_users (ignore if already exists)
             verified_data = {
                 "email": email,
-                "verified_at": datetime.utcnow().isoformat(),
-                "last_login": datetime.utcnow().isoformat()
+                "verified_at": now_iso,
+                "last_login": now_iso
             }
             
             sb.table("verified_users").upsert(verified_data, on_conflict="email").execute()
@@ -140,8 +145,6 @@ def update_last_login(email: str):
 def send_verification_email_fastapi(email: str, token: str, app_url: str) -> bool:
     """Send verification email using Resend (FastAPI version)"""
     try:
-        import resend
-        
         # Get API key from environment variable
         resend_api_key = os.getenv("RESEND_API_KEY")
         print(f"🔍 Email Debug: RESEND_API_KEY = {resend_api_key[:10] if resend_api_key else 'None'}...")
@@ -149,9 +152,6 @@ def send_verification_email_fastapi(email: str, token: str, app_url: str) -> boo
             print("❌ RESEND_API_KEY environment variable not set")
             return False
         
-        # Set API key
-        resend.api_key = resend_api_key
-        
         # For development, use Resend's sandbox domain
         from_email = "Acme <onboarding@resend.dev>"
         
@@ -175,51 +175,22 @@ def send_verification_email_fastapi(email: str, token: str, app_url: str) -> boo
             return True
         
         # Production code (when you have a verified domain)
-        response = resend.Emails.send({
+        email_id = send_email(resend_api_key, {
             "from": from_email,
             "to": [email],
             "subject": "Verify your email - Reddit SaaS Idea Finder",
-            "html": f"""
-            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                <h2 style="color: #333;">🚀 Welcome to Reddit SaaS Idea Finder!</h2>
-                <p>Thanks for signing up! Click the button below to verify your email address and unlock 15 scrapes per day:</p>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{verification_url}" style="background-color: #007bff; color: white; padding: 14px 30px; text-decoration: none; border-radius: 6px; display: inline-block; font-weight: bold;">
-                        ✅ Verify Email Address
-                    </a>
-                </div>
-                
-                <p style="color: #666; font-size: 14px;">
-                    Or copy and paste this link into your browser:<br>
-                    <a href="{verification_url}" style="color: #007bff;">{verification_url}</a>
-                </p>
-                
-                <div style="background-color: #fff3cd; padding: 15px; border-radius: 6px; margin: 20px 0;">
-                    <p style="margin: 0; color: #856404;">
-                        ⚠️ <strong>Important:</strong> This verification link will expire in 10 minutes.
-                    </p>
-                </div>
-                
-                <p style="color: #666; font-size: 14px;">
-                    If you didn't request this verification, you can safely ignore this email.
-                </p>
-            </div>
-            """
+            "html": VERIFICATION_EMAIL_TEMPLATE.substitute(verification_url=verification_url)
         })
         
-        print(f"📊 Resend response: {response}")
+        print(f"📊 Resend email id: {email_id}")
         
-        if hasattr(response, 'id') and response.id:
+        if email_id:
             print(f"✅ Email sent successfully to {email}")
             return True
         else:
             print(f"❌ Failed to send email to {email}")
             return False
             
-    except ImportError:
-        print("❌ Resend not installed. Run: pip install resend")
-        return False
     except Exception as e:
         print(f"❌ Resend error: {e}")
         print(f"🔍 Error type: {type(e).__name__}")
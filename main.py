@@ -23,12 +23,14 @@ python standalone_reddit_scraper.py \
 import argparse
 import json
 import os
+import threading
 import time
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict
 
+import orjson
 import praw
 from dotenv import load_dotenv
 from openai import OpenAI, OpenAIError
@@ -36,37 +38,58 @@ from openai import OpenAI, OpenAIError
 # -------------------- 1. Credentials & clients ------------------------------
 load_dotenv()  # pulls REDDIT_* and OPENAI_* from .env if present
 
+# PRAW instances must not be shared between threads, so the client is reused
+# per thread, not per process. Under Streamlit that means per script run:
+# each rerun gets a fresh ScriptRunner thread
+_reddit_local = threading.local()
+
 def get_reddit_client():
     """Get Reddit client with credentials from Streamlit secrets or environment variables"""
+    # Reuse this thread's client so every subreddit shares its OAuth token and HTTP session
+    reddit_client = getattr(_reddit_local, "client", None)
+    if reddit_client:
+        return reddit_client
+
     try:
         import streamlit as st
-        return praw.Reddit(
+        reddit_client = praw.Reddit(
             client_id=st.secrets.get("REDDIT_CLIENT_ID") or os.getenv("REDDIT_CLIENT_ID"),
             client_secret=st.secrets.get("REDDIT_CLIENT_SECRET") or os.getenv("REDDIT_CLIENT_SECRET"),
             user_agent=st.secrets.get("REDDIT_USER_AGENT") or os.getenv("REDDIT_USER_AGENT", "reddit-scraper/0.3"),
         )
     except:
         # Fallback to environment variables only
-        return praw.Reddit(
+        reddit_client = praw.Reddit(
             client_id=os.getenv("REDDIT_CLIENT_ID"),
             client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
             user_agent=os.getenv("REDDIT_USER_AGENT", "reddit-scraper/0.3"),
         )
+    _reddit_local.client = reddit_client
+    return reddit_client
+
+_openai_client = None
 
 def get_openai_client():
     """Get OpenAI client with credentials from Streamlit secrets or environment variables"""
+    global _openai_client
+
+    # Reuse one client so consecutive calls share its keep-alive connection pool
+    if _openai_client:
+        return _openai_client
+
     try:
         import streamlit as st
-        return OpenAI(
+        _openai_client = OpenAI(
             api_key=st.secrets.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY"),
             organization=st.secrets.get("OPENAI_ORG") or os.getenv("OPENAI_ORG") or None,
         )
     except:
         # Fallback to environment variables only
-        return OpenAI(
+        _openai_client = OpenAI(
             api_key=os.getenv("OPENAI_API_KEY"),
             organization=os.getenv("OPENAI_ORG") or None,
         )
+    return _openai_client
 
 MODEL = "o4-mini"
 TEMPERATURE = 0.45  # a touch more variety
@@ -194,6 +217,14 @@ def build_context(post, max_comments=10):
         context += "Top Comments:\n" + "\n".join(comments)
     return context
 
+def get_problem_description(analysis: dict) -> str:
+    """Problem description from an analysis, falling back to the opportunity description or a generic one"""
+    return (
+        analysis.get("problem_description")
+        or analysis.get("opportunity_description")
+        or "A viable business opportunity identified from Reddit discussion"
+    )
+
 def scrape_subreddit(name: str, post_limit: int, max_comments: int, already_seen_ids=None) -> List[Dict]:
     # Fetch a large batch to ensure we can find enough new posts
     batch_size = max(50, post_limit * 3)
@@ -203,7 +234,11 @@ def scrape_subreddit(name: str, post_limit: int, max_comments: int, already_seen
     for submission in reddit_client.subreddit(name).new(limit=batch_size):
         if submission.id in seen:
             continue
-        submission.comments.replace_more(limit=0)
+        # Ask Reddit for the top max_comments only instead of expanding the
+        # whole tree; MoreComments stubs are skipped
+        submission.comment_sort = "top"
+        submission.comment_limit = max_comments
+        top_comments = list(submission.comments)[:max_comments]
         items.append(
             {
                 "id": submission.id,
@@ -211,7 +246,7 @@ def scrape_subreddit(name: str, post_limit: int, max_comments: int, already_seen
                 "url": f"https://reddit.com{submission.permalink}",
                 "title": submission.title,
                 "body": submission.selftext or "",
-                "comments": [c.body for c in submission.comments.list()[:max_comments]],
+                "comments": [c.body for c in top_comments if hasattr(c, "body")],
             }
         )
         if len(items) >= post_limit:
@@ -230,11 +265,13 @@ def run_pipeline(
     db_path = Path("scraper.db")
     if db_path.exists():
         import sqlite3
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        cur.execute("SELECT post_id FROM scraped_posts")
-        seen_ids = {row[0] for row in cur.fetchall()}
-        conn.close()
+        # Read-only connection: takes no write lock, and waits out a busy
+        # writer instead of failing immediately with "database is locked"
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=30)
+        try:
+            seen_ids = {row[0] for row in conn.execute("SELECT post_id FROM scraped_posts")}
+        finally:
+            conn.close()
 
     for sub in subs:
         print(f"\n### r/{sub}")
@@ -274,13 +311,7 @@ def run_pipeline(
                 continue
 
             # 2. MVP solution (use market + structured context)
-            problem_desc = analysis.get("problem_description", "")
-            if not problem_desc:
-                # Fallback: use opportunity_description if available
-                problem_desc = analysis.get("opportunity_description", "")
-            if not problem_desc:
-                # Final fallback: use a generic description
-                problem_desc = "A viable business opportunity identified from Reddit discussion"
+            problem_desc = get_problem_description(analysis)
                 
             sol = oai_json(
                 SOLUTION_PROMPT.format(
@@ -356,9 +387,9 @@ def main():
         return
 
     out_path = Path(cfg.output).expanduser()
-    with out_path.open("a", encoding="utf-8") as f:
+    with out_path.open("ab") as f:
         for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            f.write(orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE))
     print(f"\nSaved {len(rows)} entries → {out_path}")
 
 if __name__ == "__main__":
@@ -1,8 +1,8 @@
-from fastapi import FastAPI, Request, Form, HTTPException, Depends
+from fastapi import FastAPI, Request, Form, HTTPException, Depends, BackgroundTasks
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
 import uvicorn
 from typing import List, Optional
@@ -10,39 +10,13 @@ import json
 from datetime import date, datetime, timedelta
 import os
 import secrets
+from functools import lru_cache
+import jwt
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Debug: Check if environment variables are loaded
-print("🔍 Environment Debug:")
-print(f"RESEND_API_KEY set: {'✅ Yes' if os.getenv('RESEND_API_KEY') else '❌ No'}")
-print(f"RESEND_API_KEY value: {os.getenv('RESEND_API_KEY', 'Not set')[:10] if os.getenv('RESEND_API_KEY') else 'Not set'}...")
-print(f"Current working directory: {os.getcwd()}")
-print(f".env file exists: {'✅ Yes' if os.path.exists('.env') else '❌ No'}")
-
-# Debug: Check .env file contents
-if os.path.exists('.env'):
-    print("🔍 .env file contents:")
-    try:
-        with open('.env', 'r') as f:
-            lines = f.readlines()
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    if 'RESEND_API_KEY' in line:
-                        print(f"  Found RESEND_API_KEY line: {line[:20]}...")
-                    else:
-                        print(f"  Other line: {line[:50]}...")
-    except Exception as e:
-        print(f"  Error reading .env file: {e}")
-
-# Try loading .env with explicit path
-print("🔍 Trying explicit .env loading...")
-load_dotenv('.env', override=True)
-print(f"After explicit load - RESEND_API_KEY: {'✅ Set' if os.getenv('RESEND_API_KEY') else '❌ Still not set'}")
-
 # Import the existing pipeline and auth systems
 from main import run_pipeline
 
@@ -67,7 +41,7 @@ from db_helpers import (
 )
 from fastapi_db_helpers import get_daily_usage_safe, increment_daily_usage_safe
 
-app = FastAPI(title="Reddit SaaS Idea Finder", version="1.0.0")
+app = FastAPI(title="Reddit SaaS Idea Finder", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Note: This FastAPI app runs on port 8000
 # The Streamlit version runs on port 8501
@@ -83,25 +57,52 @@ FREE_LIMIT = 2
 VERIFIED_LIMIT = 15
 
 # Session management
-SECRET_KEY = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
+@lru_cache(maxsize=1)
+def get_secret_key() -> str:
+    """JWT signing key, read on first use; the random fallback is generated once per process"""
+    return os.getenv("SECRET_KEY") or secrets.token_urlsafe(32)
+
 SESSION_COOKIE_NAME = "user_session"
 SESSION_EXPIRY_DAYS = 30
 
+def print_env_debug():
+    """Print which environment settings were picked up (run on server start only)"""
+    # Debug: Check if environment variables are loaded
+    print("🔍 Environment Debug:")
+    print(f"RESEND_API_KEY set: {'✅ Yes' if os.getenv('RESEND_API_KEY') else '❌ No'}")
+    print(f"RESEND_API_KEY value: {os.getenv('RESEND_API_KEY', 'Not set')[:10] if os.getenv('RESEND_API_KEY') else 'Not set'}...")
+    print(f"Current working directory: {os.getcwd()}")
+    print(f".env file exists: {'✅ Yes' if os.path.exists('.env') else '❌ No'}")
+
+    # Debug: Check .env file contents
+    if os.path.exists('.env'):
+        print("🔍 .env file contents:")
+        try:
+            with open('.env', 'r') as f:
+                lines = f.readlines()
+                for line in lines:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        if 'RESEND_API_KEY' in line:
+                            print(f"  Found RESEND_API_KEY line: {line[:20]}...")
+                        else:
+                            print(f"  Other line: {line[:50]}...")
+        except Exception as e:
+            print(f"  Error reading .env file: {e}")
+
 def create_session_token(email: str) -> str:
     """Create a secure session token"""
-    import jwt
     payload = {
         "email": email,
         "exp": datetime.utcnow() + timedelta(days=SESSION_EXPIRY_DAYS),
         "iat": datetime.utcnow()
     }
-    return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+    return jwt.encode(payload, get_secret_key(), algorithm="HS256")
 
 def verify_session_token(token: str) -> Optional[str]:
     """Verify and extract email from session token"""
-    import jwt
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        payload = jwt.decode(token, get_secret_key(), algorithms=["HS256"])
         return payload.get("email")
     except jwt.ExpiredSignatureError:
         return None
@@ -245,6 +246,7 @@ async def verify_email_page(request: Request):
 @app.post("/verify", response_class=HTMLResponse)
 async def verify_email(
     request: Request,
+    background_tasks: BackgroundTasks,
     email: str = Form(...)
 ):
     """Handle email verification request"""
@@ -255,38 +257,28 @@ async def verify_email(
             # Generate verification URL
             verification_url = f"{request.base_url}verify/confirm?token={token}"
             
-            # Try to send verification email
-            email_sent = send_verification_email_fastapi(email, token, str(request.base_url))
+            # Send the email after the response goes out, so the Resend
+            # round trip isn't on the request path (failures are logged by the sender)
+            background_tasks.add_task(send_verification_email_fastapi, email, token, str(request.base_url))
             
-            if email_sent:
-                # Check if we're in development mode
-                is_development = "onboarding@resend.dev" in "Acme <onboarding@resend.dev>"
-                
-                if is_development:
-                    return templates.TemplateResponse("verify.html", {
-                        "request": request,
-                        "success": f"✅ Verification record created successfully! (Development Mode)",
-                        "verification_url": verification_url,
-                        "email": email,
-                        "show_manual_link": True,
-                        "email_info": "🔧 Development mode: Email simulation successful. Use the verification link below."
-                    })
-                else:
-                    return templates.TemplateResponse("verify.html", {
-                        "request": request,
-                        "success": f"✅ Verification email sent to {email}! Check your inbox and click the verification link.",
-                        "email": email,
-                        "show_manual_link": False
-                    })
-            else:
-                # Fallback to manual link if email sending fails
+            # Check if we're in development mode
+            is_development = "onboarding@resend.dev" in "Acme <onboarding@resend.dev>"
+            
+            if is_development:
                 return templates.TemplateResponse("verify.html", {
                     "request": request,
-                    "success": f"✅ Verification record created successfully!",
+                    "success": f"✅ Verification record created successfully! (Development Mode)",
                     "verification_url": verification_url,
                     "email": email,
                     "show_manual_link": True,
-                    "email_error": "Email sending failed, but you can use the manual link below."
+                    "email_info": "🔧 Development mode: Email simulation successful. Use the verification link below."
+                })
+            else:
+                return templates.TemplateResponse("verify.html", {
+                    "request": request,
+                    "success": f"✅ Verification email sent to {email}! Check your inbox and click the verification link.",
+                    "email": email,
+                    "show_manual_link": False
                 })
         else:
             return templates.TemplateResponse("verify.html", {
@@ -384,6 +376,7 @@ async def logout(request: Request):
     return response
 
 if __name__ == "__main__":
+    print_env_debug()
     print("🚀 Starting FastAPI server...")
     print("📍 Server will be available at: http://localhost:8000")
     print("🌐 Open your browser and navigate to: http://localhost:8000")
@@ -0,0 +1,66 @@
+"""
+resend_helpers.py - Send email through the Resend HTTP API over a pooled connection
+"""
+
+from string import Template
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RESEND_API_URL = "https://api.resend.com/emails"
+
+# Parsed once at import; senders only substitute the link
+VERIFICATION_EMAIL_TEMPLATE = Template("""
+<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+    <h2 style="color: #333;">🚀 Welcome to Reddit SaaS Idea Finder!</h2>
+    <p>Thanks for signing up! Click the button below to verify your email address and unlock 15 scrapes per day:</p>
+
+    <div style="text-align: center; margin: 30px 0;">
+        <a href="$verification_url" style="background-color: #007bff; color: white; padding: 14px 30px; text-decoration: none; border-radius: 6px; display: inline-block; font-weight: bold;">
+            ✅ Verify Email Address
+        </a>
+    </div>
+
+    <p style="color: #666; font-size: 14px;">
+        Or copy and paste this link into your browser:<br>
+        <a href="$verification_url" style="color: #007bff;">$verification_url</a>
+    </p>
+
+    <div style="background-color: #fff3cd; padding: 15px; border-radius: 6px; margin: 20px 0;">
+        <p style="margin: 0; color: #856404;">
+            ⚠️ <strong>Important:</strong> This verification link will expire in 10 minutes.
+        </p>
+    </div>
+
+    <p style="color: #666; font-size: 14px;">
+        If you didn't request this verification, you can safely ignore this email.
+    </p>
+</div>
+""")
+
+# Built once at import, so concurrent first sends from the mail pool can't
+# each create (and leak) their own Session. Consecutive sends reuse one
+# keep-alive TLS connection.
+_RESEND_SESSION = requests.Session()
+# POST isn't in Retry's default allowed_methods, so only failed connects are
+# retried and an email that may have gone out is never sent twice
+_RESEND_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+))
+
+def send_email(api_key: str, params: dict) -> Optional[str]:
+    """Send one email (Resend's JSON payload) and return its id, or None if Resend rejected it"""
+    response = _RESEND_SESSION.post(
+        RESEND_API_URL,
+        json=params,
+        headers={"Authorization": f"Bearer {api_key}"},
+        timeout=(3, 10),
+    )
+    if not response.ok:
+        print(f"❌ Resend returned {response.status_code}: {response.text}")
+        return None
+    return response.json().get("id")
@@ -4,69 +4,18 @@ gui_reddit_scraper.py
 Streamlit front‑end for the standalone_reddit_scraper.py pipeline.
 """
 
-import json
+import math
+import re
 import sqlite3
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, date
+from datetime import datetime, timezone
 
+import orjson
 import pandas as pd
 import streamlit as st
 
-# Helper function for copying text to clipboard
-def copy_to_clipboard(text, key_prefix="copy"):
-    """Copy text to clipboard using JavaScript injection"""
-    try:
-        # Escape the text for JavaScript
-        escaped_text = text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r')
-        
-        # Create JavaScript code to copy to clipboard
-        js_code = f"""
-        <script>
-        function copyToClipboard() {{
-            const text = "{escaped_text}";
-            if (navigator.clipboard && window.isSecureContext) {{
-                navigator.clipboard.writeText(text).then(function() {{
-                    console.log('Copied to clipboard successfully');
-                }}).catch(function(err) {{
-                    console.error('Failed to copy: ', err);
-                    fallbackCopy();
-                }});
-            }} else {{
-                fallbackCopy();
-            }}
-            
-            function fallbackCopy() {{
-                const textArea = document.createElement('textarea');
-                textArea.value = text;
-                textArea.style.position = 'fixed';
-                textArea.style.left = '-999999px';
-                textArea.style.top = '-999999px';
-                document.body.appendChild(textArea);
-                textArea.focus();
-                textArea.select();
-                try {{
-                    document.execCommand('copy');
-                    console.log('Fallback copy successful');
-                }} catch (err) {{
-                    console.error('Fallback copy failed: ', err);
-                }}
-                document.body.removeChild(textArea);
-            }}
-        }}
-        copyToClipboard();
-        </script>
-        """
-        
-        # Inject the JavaScript
-        st.components.v1.html(js_code, height=0)
-        st.success("✅ Copied to clipboard!")
-        
-    except Exception as e:
-        # Fallback: show the text in a code block
-        st.code(text, language="text")
-        st.info("📋 Click the copy button in the code block above to copy the text.")
-
 # === 1. import the pipeline and new verification system ================================
 from main import run_pipeline  # same dir
 from email_verification import (
@@ -81,12 +30,16 @@ from email_verification import (
     update_last_login
 )
 from db_helpers import (
-    save_scraped_result_new, 
-    get_all_scraped_results_new, 
+    save_scraped_results_bulk,
+    get_daily_usage_new,
+    increment_daily_usage_new,
+    get_all_scraped_results_new,
     save_to_session_state, 
     get_session_results, 
     mark_post_scraped_new, 
-    is_post_already_scraped_new
+    mark_posts_scraped_new,
+    is_post_already_scraped_new,
+    get_scraped_post_ids
 )
 
 # Handle magic link authentication (will be called after UI setup)
@@ -94,11 +47,12 @@ from db_helpers import (
 # === 1.5. Quota management ===================================================
 FREE_LIMIT = 2
 VERIFIED_LIMIT = 15
-usage_key = f"usage_{date.today()}"
+# Keyed on the UTC day so it rolls over with Supabase's CURRENT_DATE (UTC),
+# which the verified users' stored count is read and incremented against
+usage_key = f"usage_{datetime.now(timezone.utc).date()}"
 st.session_state.setdefault(usage_key, 0)
 
-def can_scrape():
-    is_verified = is_user_verified()
+def can_scrape(is_verified: bool):
     limit = VERIFIED_LIMIT if is_verified else FREE_LIMIT
     used = st.session_state[usage_key]
     if used >= limit:
@@ -113,9 +67,8 @@ def can_scrape():
             return False
     return True
 
-def show_quota_status():
+def show_quota_status(is_verified: bool):
     """Display current quota usage in the sidebar"""
-    is_verified = is_user_verified()
     limit = VERIFIED_LIMIT if is_verified else FREE_LIMIT
     used = st.session_state[usage_key]
     remaining = max(0, limit - used)
@@ -126,11 +79,115 @@ def show_quota_status():
     st.sidebar.markdown(f"**{used}/{limit}** scrapes used")
     st.sidebar.markdown(f"**{remaining}** remaining today")
 
+def prompt_strings_from(playbook):
+    """Flatten a Cursor playbook ({"prompts": [...]} or a bare list) into prompt strings"""
+    if isinstance(playbook, dict):
+        prompts = playbook.get("prompts") or []
+    else:
+        prompts = playbook if isinstance(playbook, list) else []
+
+    # Convert prompts to strings if they're dictionaries
+    prompt_strings = []
+    for prompt in prompts:
+        if isinstance(prompt, dict):
+            # If it's a dict, try to extract the text content
+            if "content" in prompt:
+                prompt_strings.append(str(prompt["content"]))
+            elif "text" in prompt:
+                prompt_strings.append(str(prompt["text"]))
+            else:
+                prompt_strings.append(str(prompt))
+        else:
+            prompt_strings.append(str(prompt))
+    return prompt_strings
+
+@st.cache_data(max_entries=1000, show_spinner=False)
+def normalize_prompts(record_id: str, _playbook):
+    """prompt_strings_from() cached by record id (the underscore keeps the playbook out of the cache key)"""
+    return prompt_strings_from(_playbook)
+
+RESULTS_PAGE_SIZE = 50
+
+def show_results_table(results):
+    """Display one page of results as a DataFrame"""
+    total = len(results)
+    page_count = max(1, math.ceil(total / RESULTS_PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+    start = (page - 1) * RESULTS_PAGE_SIZE
+    window = results[start:start + RESULTS_PAGE_SIZE]
+
+    # Build columns in one pass and truncate with the vectorised .str accessor
+    titles = [r['reddit']['title'] for r in window]
+    analyses = [r['analysis'].get('problem_description', '') for r in window]
+    solutions = [r['solution'].get('solution_description', '') for r in window]
+    df = pd.DataFrame({
+        "reddit": pd.Series(titles, dtype="object").str.slice(0, 50) + "...",
+        "analysis": pd.Series(analyses, dtype="object").str.slice(0, 100) + "...",
+        "solution": pd.Series(solutions, dtype="object").str.slice(0, 100) + "..."
+    })
+    st.dataframe(df, use_container_width=True)
+    st.caption(f"Page {page} of {page_count}")
+
+@st.fragment
+def show_playbook_panel(results, user_email):
+    """Record picker and its playbook prompts; picking a record reruns only this fragment"""
+    # Let user select a record by index or title; labels are rebuilt only
+    # when the result set changes, not on every rerun
+    options_key = (user_email, tuple(r["meta"]["uuid"] for r in results))
+    if st.session_state.get("_options_key") != options_key:
+        st.session_state["_options"] = [
+            f"{i}: {r['reddit'].get('title', r['reddit'].get('url', 'No title'))[:60]}"
+            for i, r in enumerate(results)
+        ]
+        st.session_state["_options_key"] = options_key
+    selected = st.selectbox("Select a record to view its playbook prompts:", st.session_state["_options"], index=0)
+    idx = int(selected.split(":")[0])
+    result = results[idx]
+    playbook = result.get("cursor_playbook", [])
+    reddit_info = result["reddit"]
+    analysis_info = result["analysis"]
+    st.markdown(f"**Post Title:** [{reddit_info.get('title', 'No title')}]({reddit_info.get('url', '#')})")
+    st.markdown(f"**Summary:** {analysis_info.get('problem_description', '')}")
+    prompt_strings = normalize_prompts(result["meta"]["uuid"], playbook)
+
+    if prompt_strings:
+        st.markdown("**Numbered List:**")
+        for i, prompt in enumerate(prompt_strings, 1):
+            st.markdown(f"{i}. {prompt}")
+        
+        # st.code ships its own copy button
+        st.markdown("**Code Block (copy all):**")
+        st.code("\n\n".join(prompt_strings), language="text")
+    else:
+        st.info("No playbook prompts found for this record.")
+
+@st.fragment
+def show_scrape_report(report):
+    """Scrape report with a status filter; toggling the filter reruns only this fragment"""
+    report_df = pd.DataFrame(report)
+    st.markdown("### Scrape Report")
+    filter_option = st.radio(
+        "Show:",
+        ("All", "Viable only", "Not viable only"),
+        index=0,
+        horizontal=True
+    )
+    if filter_option == "Viable only":
+        filtered_df = report_df.query("status == 'Added'")
+    elif filter_option == "Not viable only":
+        filtered_df = report_df.query("status == 'Not viable'")
+    else:
+        filtered_df = report_df
+    st.dataframe(filtered_df[["title", "url", "status", "details"]], use_container_width=True)
+
 # === 2. DB helpers ===========================================================
 # Legacy SQLite functions (kept for backward compatibility)
 DB_FILE = Path("scraper.db")
 OUT_FILE = Path("results.jsonl")
 
+# Post id from a Reddit permalink, e.g. .../comments/abc123/some_title/
+_POST_ID_RE = re.compile(r"comments/([a-z0-9]+)/")
+
 def init_db():
     # This is now a no-op since we're using Supabase
     return None
@@ -141,6 +198,140 @@ def already_scraped(conn, post_id: str) -> bool:
 def mark_scraped(conn, post_id: str):
     mark_post_scraped_new(post_id)
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_results(user_email: str):
+    """Supabase results for a verified user, cached so reruns skip the round trip"""
+    return get_all_scraped_results_new()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _results_json(user_email: str) -> bytes:
+    """JSON download payload for a verified user, serialised once per cache window"""
+    return orjson.dumps(_load_results(user_email), option=orjson.OPT_INDENT_2)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _email_verified_cached(email: str) -> bool:
+    """is_email_verified() memoised per email; misses raise so a fresh verification isn't masked"""
+    if not is_email_verified(email):
+        raise LookupError(email)
+    return True
+
+def email_verified(email: str) -> bool:
+    """Like is_email_verified(), but positive answers are reused for five minutes"""
+    try:
+        return _email_verified_cached(email)
+    except LookupError:
+        return False
+
+def _reddit():
+    """PRAW client for URL analyses, reused within one script run via get_reddit_client().
+    Not st.cache_resource: PRAW instances must not be shared across threads."""
+    try:
+        from main import get_reddit_client
+        return get_reddit_client()
+    except Exception:
+        import praw
+        import os
+        return praw.Reddit(
+            client_id=os.getenv("REDDIT_CLIENT_ID"),
+            client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+            user_agent=os.getenv("REDDIT_USER_AGENT", "reddit-scraper/0.3"),
+        )
+
+@st.cache_resource
+def _mail_pool():
+    """Shared worker pool so sending a verification email doesn't block the script run"""
+    return ThreadPoolExecutor(max_workers=4)
+
+def _send_verification_email_logged(email: str, token: str, app_url: str):
+    """send_verification_email() for the mail pool; no UI is attached, so failures are printed"""
+    try:
+        if not send_verification_email(email, token, app_url):
+            print(f"❌ Verification email to {email} was not sent")
+    except Exception as e:
+        print(f"❌ Verification email to {email} failed: {e}")
+
+@st.cache_resource
+def _app_url() -> str:
+    """Base URL for verification links; the server config doesn't change, so it's resolved once"""
+    try:
+        # Try to get current URL from Streamlit
+        app_url = st.get_option("server.baseUrlPath") or "http://localhost:8501"
+        if "localhost" in app_url or "127.0.0.1" in app_url:
+            # We're running locally
+            return "http://localhost:8501"
+        # We're on Streamlit Cloud
+        return "https://cursorprompter-1.streamlit.app"
+    except:
+        # Fallback
+        return "http://localhost:8501"
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _oai_json_cached(prompt: str) -> dict:
+    """oai_json() memoised on the prompt; failures raise so they are never cached"""
+    from main import oai_json
+    result = oai_json(prompt)
+    if not result:
+        raise ValueError("Empty OpenAI response")
+    return result
+
+def cached_oai_json(prompt: str) -> dict:
+    """Like oai_json(), but an identical prompt within the hour is served from cache"""
+    try:
+        return _oai_json_cached(prompt)
+    except ValueError:
+        return {}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def analyze_post(post_id: str) -> dict:
+    """Fetch a Reddit post and run analysis → solution → playbook on it, cached per post id.
+    OpenAI failures raise so they are never cached; a non-viable post stops after the analysis."""
+    from main import build_context, get_problem_description, ANALYSIS_PROMPT, SOLUTION_PROMPT, CURSOR_PLAYBOOK_PROMPT
+
+    submission = _reddit().submission(id=post_id)
+    # Ask Reddit for the top 15 comments only; MoreComments stubs
+    # are skipped rather than expanded
+    submission.comment_sort = "top"
+    submission.comment_limit = 15
+    top_comments = list(submission.comments)[:15]
+    post = {
+        "id": submission.id,
+        "subreddit": str(submission.subreddit),
+        "url": f"https://reddit.com{submission.permalink}",
+        "title": submission.title,
+        "body": submission.selftext or "",
+        "comments": [c.body for c in top_comments if hasattr(c, "body")],
+    }
+
+    context = build_context(post, max_comments=10)
+    analysis = cached_oai_json(ANALYSIS_PROMPT.format(content=context))
+    if not analysis:
+        raise RuntimeError("OpenAI error during analysis step.")
+    if not analysis.get("is_viable"):
+        return {"post": post, "analysis": analysis, "solution": {}, "playbook": {}}
+
+    problem_desc = get_problem_description(analysis)
+    sol = cached_oai_json(
+        SOLUTION_PROMPT.format(
+            problem=problem_desc,
+            market=analysis.get("target_market", ""),
+            context=context,
+        )
+    )
+    if not sol:
+        raise RuntimeError("OpenAI error during solution step.")
+
+    playbook = cached_oai_json(
+        CURSOR_PLAYBOOK_PROMPT.format(
+            problem=problem_desc,
+            market=analysis.get("target_market", ""),
+            solution=sol.get("solution_description", ""),
+        )
+    )
+    if not playbook:
+        raise RuntimeError("OpenAI error during playbook step.")
+
+    return {"post": post, "analysis": analysis, "solution": sol, "playbook": playbook}
+
 # === 3. Streamlit UI =========================================================
 st.set_page_config(
     page_title="Reddit → SaaS Idea Finder", 
@@ -154,7 +345,7 @@ params = st.query_params
 if "email" in params and "user_email" not in st.session_state:
     email_from_url = params["email"]
     # Verify the email is actually verified in our database
-    if is_email_verified(email_from_url):
+    if email_verified(email_from_url):
         st.session_state["user_email"] = email_from_url
         st.session_state["is_verified"] = True
         st.success(f"✅ Welcome back, {email_from_url}!")
@@ -164,8 +355,17 @@ st.sidebar.header("Scrape controls")
 # Handle verification flow first
 handle_verification_flow()
 
-# Authentication status and verification button
+# Look the user up once per rerun; every section below reads these two names
 user_email = get_current_user_email()
+is_verified = is_user_verified()
+
+# Verified users' quota is kept in Supabase so it follows them across sessions;
+# read it once per session (and again if a different user signs in)
+if is_verified and st.session_state.get("_usage_synced_for") != (user_email, usage_key):
+    st.session_state[usage_key] = get_daily_usage_new(user_email)
+    st.session_state["_usage_synced_for"] = (user_email, usage_key)
+
+# Authentication status and verification button
 if user_email:
     st.sidebar.success(f"✅ Verified as {user_email}")
     if st.sidebar.button("🚪 Sign Out", use_container_width=True):
@@ -175,25 +375,26 @@ else:
     if st.sidebar.button("🔐 Verify Email", use_container_width=True):
         st.session_state.show_verification = True
 
-subs = st.sidebar.text_input(
-    "Subreddits (comma‑separated)", 
-    value="vibecoding, smallbusiness",
-    placeholder="ex: vibecoding, smallbusiness"
-)
-posts_per = st.sidebar.slider("Posts per subreddit", 1, 3, 2)
-cmts_per = st.sidebar.slider("Comments per post", 1, 30, 15)
-scrape_btn = st.sidebar.button("🚀 Scrape now", use_container_width=True)
+# Inside a form, editing the controls doesn't rerun the app until "Scrape now" is pressed
+with st.sidebar.form("scrape_form"):
+    subs = st.text_input(
+        "Subreddits (comma‑separated)", 
+        value="vibecoding, smallbusiness",
+        placeholder="ex: vibecoding, smallbusiness"
+    )
+    posts_per = st.slider("Posts per subreddit", 1, 3, 2)
+    cmts_per = st.slider("Comments per post", 1, 30, 15)
+    scrape_btn = st.form_submit_button("🚀 Scrape now", use_container_width=True)
 
 # Show quota status
-show_quota_status()
+show_quota_status(is_verified)
 
 # === 2. Authentication Section ===
 st.markdown("---")
 st.subheader("🔐 Authentication")
 
 # Check if user is already verified
-if is_user_verified():
-    user_email = get_current_user_email()
+if is_verified:
     st.success(f"✅ Signed in as: {user_email}")
     if st.button("🚪 Sign Out"):
         sign_out_verified_user()
@@ -220,22 +421,8 @@ else:
                     token = create_verification_record(email)
                     
                     if token:
-                        # Get the current app URL dynamically
-                        try:
-                            # Try to get current URL from Streamlit
-                            app_url = st.get_option("server.baseUrlPath") or "http://localhost:8501"
-                            if "localhost" in app_url or "127.0.0.1" in app_url:
-                                # We're running locally
-                                app_url = "http://localhost:8501"
-                            else:
-                                # We're on Streamlit Cloud
-                                app_url = "https://cursorprompter-1.streamlit.app"
-                        except:
-                            # Fallback
-                            app_url = "http://localhost:8501"
-                        
-                        # Send verification email (placeholder for now)
-                        send_verification_email(email, token, app_url)
+                        # Send verification email in the background
+                        _mail_pool().submit(_send_verification_email_logged, email, token, _app_url())
                         
                         st.success("✅ Verification email sent! Check your inbox and click the link to verify.")
                         st.info("After clicking the verification link, you'll be redirected back here and automatically verified.")
@@ -254,7 +441,7 @@ else:
             
             if sign_in_button and email:
                 with st.spinner("Checking verification status..."):
-                    if is_email_verified(email):
+                    if email_verified(email):
                         # User is verified, sign them in
                         st.session_state["user_email"] = email
                         st.session_state["is_verified"] = True
@@ -284,33 +471,20 @@ analyze_url_btn = st.sidebar.button("Analyze URL", use_container_width=True)
 st.title("💡 Reddit → SaaS Idea Finder")
 
 # Load existing results from database or session
-user_email = get_current_user_email()
-
 if user_email:
-    # Verified user - load from Supabase
-    results = get_all_scraped_results_new()
+    # Verified user - load from Supabase (cached per user, cleared after a scrape)
+    results = _load_results(user_email)
     if results:
         st.write(f"📊 Total records loaded: {len(results)}")
-        # Convert to DataFrame for display
-        df_data = []
-        for result in results:
-            df_data.append({
-                "reddit": f"{result['reddit']['title'][:50]}...",
-                "analysis": result['analysis'].get('problem_description', '')[:100] + "...",
-                "solution": result['solution'].get('solution_description', '')[:100] + "..."
-            })
-        df = pd.DataFrame(df_data)
-        st.dataframe(df, use_container_width=True)
-        
+        show_results_table(results)
+
         # Download button for verified users
-        if st.button("⬇️ Download Results as JSON"):
-            json_data = json.dumps(results, indent=2, ensure_ascii=False)
-            st.download_button(
-                label="📥 Download JSON",
-                data=json_data,
-                file_name="scraped_results.json",
-                mime="application/json"
-            )
+        st.download_button(
+            label="⬇️ Download Results as JSON",
+            data=_results_json(user_email),
+            file_name="scraped_results.json",
+            mime="application/json"
+        )
     else:
         st.info("No previous results found. Start scraping to see your data!")
 else:
@@ -318,15 +492,7 @@ else:
     results = get_session_results()
     if results:
         st.write(f"📊 Session records: {len(results)} (will be lost on page refresh)")
-        df_data = []
-        for result in results:
-            df_data.append({
-                "reddit": f"{result['reddit']['title'][:50]}...",
-                "analysis": result['analysis'].get('problem_description', '')[:100] + "...",
-                "solution": result['solution'].get('solution_description', '')[:100] + "..."
-            })
-        df = pd.DataFrame(df_data)
-        st.dataframe(df, use_container_width=True)
+        show_results_table(results)
     else:
         st.info("No data yet – run your first scrape!")
 
@@ -334,64 +500,13 @@ else:
 if results and len(results) > 0:
     st.markdown("---")
     st.subheader("📝 View Cursor Playbook Prompts")
-    # Let user select a record by index or title
-    options = [
-        f"{i}: {result['reddit']['title'][:60]}"
-        for i, result in enumerate(results)
-    ]
-    selected = st.selectbox("Select a record to view its playbook prompts:", options, index=0)
-    idx = int(selected.split(":")[0])
-    result = results[idx]
-    playbook = result.get("cursor_playbook", [])
-    reddit_info = result["reddit"]
-    analysis_info = result["analysis"]
-    st.markdown(f"**Post Title:** [{reddit_info.get('title', 'No title')}]({reddit_info.get('url', '#')})")
-    st.markdown(f"**Summary:** {analysis_info.get('problem_description', '')}")
-    if isinstance(playbook, dict) and "prompts" in playbook:
-        prompts = playbook["prompts"]
-    else:
-        prompts = playbook if isinstance(playbook, list) else []
-    
-    # Convert prompts to strings if they're dictionaries
-    if prompts:
-        prompt_strings = []
-        for prompt in prompts:
-            if isinstance(prompt, dict):
-                # If it's a dict, try to extract the text content
-                if "content" in prompt:
-                    prompt_strings.append(str(prompt["content"]))
-                elif "text" in prompt:
-                    prompt_strings.append(str(prompt["text"]))
-                else:
-                    prompt_strings.append(str(prompt))
-            else:
-                prompt_strings.append(str(prompt))
-        
-        st.markdown("**Numbered List:**")
-        for i, prompt in enumerate(prompt_strings, 1):
-            # Create a row with the prompt text and copy button
-            col1, col2 = st.columns([0.9, 0.1])
-            with col1:
-                st.markdown(f"{i}. {prompt}")
-            with col2:
-                if st.button("📋", key=f"copy_{i}", help=f"Copy prompt {i} to clipboard"):
-                    copy_to_clipboard(prompt, f"prompt_{i}")
-        
-        # Copy all prompts button
-        if st.button("📋 Copy All Prompts", key="copy_all_prompts", help="Copy all prompts to clipboard"):
-            copy_to_clipboard("\n\n".join(prompt_strings), "all_prompts")
-        
-        st.markdown("**Code Block (copy all):**")
-        st.code("\n\n".join(prompt_strings), language="text")
-    else:
-        st.info("No playbook prompts found for this record.")
+    show_playbook_panel(results, user_email)
 
 # === 4. Run scrape on click ==================================================
 if scrape_btn:
-    if not can_scrape():
+    if not can_scrape(is_verified):
         st.stop()
     
-    conn = init_db()
     subreddit_list = [s.strip() for s in subs.split(",") if s.strip()]
     progress_feed = st.empty()
     with st.spinner("Scraping Reddit and calling GPT…"):
@@ -402,46 +517,35 @@ if scrape_btn:
         results, report = run_pipeline(
             subreddit_list, posts_per, cmts_per, delay=1.2
         )
-        for rec in results:
-            post_id = rec["reddit"].get("id")
-            if not post_id:
-                # fallback to URL extraction if id is missing
-                post_id = rec["reddit"]["url"].split("/")[-3]
-            print(f"Checking post_id: {post_id} for title: {rec['reddit'].get('title')}")
-            if already_scraped(conn, post_id):
-                continue
-            mark_scraped(conn, post_id)
-            new_records.append(rec)
-        # Show report table after scraping
-        if report:
-            report_df = pd.DataFrame(report)
-            st.markdown("### Scrape Report")
-            filter_option = st.radio(
-                "Show:",
-                ("All", "Viable only", "Not viable only"),
-                index=0,
-                horizontal=True
-            )
-            if filter_option == "Viable only":
-                filtered_df = report_df[report_df["status"] == "Added"]
-            elif filter_option == "Not viable only":
-                filtered_df = report_df[report_df["status"] == "Not viable"]
-            else:
-                filtered_df = report_df
-            st.dataframe(filtered_df[["title", "url", "status", "details"]], use_container_width=True)
+        # Key records by post id (fallback to URL extraction if id is missing),
+        # then keep only unseen ids and mark them all in one insert
+        records_by_id = {
+            rec["reddit"].get("id") or rec["reddit"]["url"].split("/")[-3]: rec
+            for rec in results
+        }
+        # One query, limited to this batch's ids, instead of one per record
+        known_ids = get_scraped_post_ids(list(records_by_id))
+        fresh_ids = [post_id for post_id in records_by_id if post_id not in known_ids]
+        mark_posts_scraped_new(fresh_ids)
+        new_records = [records_by_id[post_id] for post_id in fresh_ids]
+        # Keep the report for the rerun below; it is rendered by show_scrape_report()
+        st.session_state["last_report"] = report
         if new_records:
             # Save to database or session state
-            is_verified = is_user_verified()
-            for record in new_records:
-                if is_verified:
-                    # Verified user - save to Supabase
-                    save_scraped_result_new(record)
-                else:
-                    # Anonymous user - save to session state
+            if is_verified:
+                # Verified user - save to Supabase in a single bulk insert
+                save_scraped_results_bulk(new_records, user_id=user_email)
+                _load_results.clear()
+                _results_json.clear()
+            else:
+                # Anonymous user - save to session state
+                for record in new_records:
                     save_to_session_state(record)
-            
+
             st.success(f"Added {len(new_records)} new record(s)!")
             st.session_state[usage_key] += 1
+            if is_verified:
+                increment_daily_usage_new(user_email)
         else:
             st.warning("Nothing new this time – you're up to date!")
     # refresh table after scrape (works on all Streamlit versions)
@@ -451,10 +555,12 @@ if scrape_btn:
         st.experimental_rerun()          # older releases
     # else: very old version – quietly skip the refresh
 
+# Report of the most recent scrape, kept across reruns
+if st.session_state.get("last_report"):
+    show_scrape_report(st.session_state["last_report"])
+
 # === 5. Analyze Reddit Post by URL ===
 if analyze_url_btn and url_to_analyze:
-    from praw.models import Submission
-    import re
     st.markdown("---")
     st.subheader("🔎 Analysis for Pasted Reddit Post URL")
     
@@ -471,152 +577,53 @@ if analyze_url_btn and url_to_analyze:
         url_status_text.text("🔍 Extracting post ID from URL...")
         url_progress_bar.progress(10)
         
-        match = re.search(r"comments/([a-z0-9]+)/", url_to_analyze)
+        match = _POST_ID_RE.search(url_to_analyze)
         if not match:
             st.error("Could not extract post ID from URL. Please check the format.")
         else:
             post_id = match.group(1)
             
-            # Fetch post using PRAW
-            url_status_text.text("📡 Fetching Reddit post data...")
+            # Fetch + three OpenAI steps in one call, served from cache on a repeat
+            url_status_text.text("🧠 Fetching and analyzing post...")
             url_progress_bar.progress(20)
             
-            reddit = None
-            try:
-                from main import get_reddit_client
-                reddit = get_reddit_client()
-            except Exception:
-                import praw
-                import os
-                reddit = praw.Reddit(
-                    client_id=os.getenv("REDDIT_CLIENT_ID"),
-                    client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-                    user_agent=os.getenv("REDDIT_USER_AGENT", "reddit-scraper/0.3"),
-                )
             try:
-                submission = reddit.submission(id=post_id)
-                submission.comments.replace_more(limit=0)
-                post = {
-                    "id": submission.id,
-                    "subreddit": str(submission.subreddit),
-                    "url": f"https://reddit.com{submission.permalink}",
-                    "title": submission.title,
-                    "body": submission.selftext or "",
-                    "comments": [c.body for c in submission.comments.list()[:15]],
-                }
+                outcome = analyze_post(post_id)
+                post, analysis = outcome["post"], outcome["analysis"]
+                sol, playbook = outcome["solution"], outcome["playbook"]
                 
-                url_status_text.text("🧠 Analyzing post content...")
-                url_progress_bar.progress(40)
-                
-                from main import build_context, oai_json, ANALYSIS_PROMPT, SOLUTION_PROMPT, CURSOR_PLAYBOOK_PROMPT
-                context = build_context(post, max_comments=10)
-                analysis = oai_json(ANALYSIS_PROMPT.format(content=context))
-                
-                if not analysis:
-                    url_progress_bar.progress(100)
-                    url_status_text.text("❌ OpenAI error during analysis step.")
-                    st.error("OpenAI error during analysis step.")
-                elif not analysis.get("is_viable"):
+                if not analysis.get("is_viable"):
                     url_progress_bar.progress(100)
                     url_status_text.text("⏭️ Post not viable - skipping further analysis.")
                     st.warning("This post was not found to be a viable problem or opportunity.")
                     st.json(analysis)
                 else:
-                    url_status_text.text("💡 Generating solution...")
-                    url_progress_bar.progress(60)
-                    
-                    problem_desc = analysis.get("problem_description", "")
-                    if not problem_desc:
-                        # Fallback: use opportunity_description if available
-                        problem_desc = analysis.get("opportunity_description", "")
-                    if not problem_desc:
-                        # Final fallback: use a generic description
-                        problem_desc = "A viable business opportunity identified from Reddit discussion"
-                        
-                    sol = oai_json(
-                        SOLUTION_PROMPT.format(
-                            problem=problem_desc,
-                            market=analysis.get("target_market", ""),
-                            context=context,
-                        )
-                    )
-                    
-                    url_status_text.text("📝 Creating Cursor playbook...")
-                    url_progress_bar.progress(80)
-                    
-                    playbook = oai_json(
-                        CURSOR_PLAYBOOK_PROMPT.format(
-                            problem=problem_desc,
-                            market=analysis.get("target_market", ""),
-                            solution=sol.get("solution_description", ""),
-                        )
-                    )
+                    from main import get_problem_description
+                    problem_desc = get_problem_description(analysis)
                     
                     url_progress_bar.progress(100)
                     url_status_text.text("✅ Analysis completed!")
                     
                     # Display results
                     st.markdown(f"**Post Title:** [{post['title']}]({post['url']})")
-                    problem_desc = analysis.get('problem_description', '')
-                    if not problem_desc:
-                        problem_desc = analysis.get('opportunity_description', '')
-                    if not problem_desc:
-                        problem_desc = 'A viable business opportunity identified from Reddit discussion'
                     st.markdown(f"**Summary:** {problem_desc}")
                     st.markdown(f"**Target Market:** {analysis.get('target_market', '')}")
                     st.markdown(f"**Confidence Score:** {analysis.get('confidence_score', '')}")
                     st.markdown(f"**Opportunity:** {'Yes' if analysis.get('is_opportunity') else 'No'}")
                     
-                    # Analysis section with copy button
-                    col1, col2 = st.columns([0.9, 0.1])
-                    with col1:
-                        st.markdown("**Analysis:**")
-                    with col2:
-                        if st.button("📋", key="url_analysis_copy", help="Copy analysis to clipboard"):
-                            analysis_text = json.dumps(analysis, indent=2, ensure_ascii=False)
-                            copy_to_clipboard(analysis_text, "url_analysis")
+                    st.markdown("**Analysis:**")
                     st.json(analysis)
                     
-                    # Solution section with copy button
-                    col1, col2 = st.columns([0.9, 0.1])
-                    with col1:
-                        st.markdown("**Solution:**")
-                    with col2:
-                        if st.button("📋", key="url_solution_copy", help="Copy solution to clipboard"):
-                            solution_text = json.dumps(sol, indent=2, ensure_ascii=False)
-                            copy_to_clipboard(solution_text, "url_solution")
+                    st.markdown("**Solution:**")
                     st.json(sol)
                         
-                    if playbook and playbook.get("prompts"):
+                    prompt_strings = prompt_strings_from(playbook)
+                    if prompt_strings:
                         st.markdown("**Cursor Playbook Prompts:**")
-                        prompts = playbook["prompts"]
-                        # Convert prompts to strings if they're dictionaries
-                        prompt_strings = []
-                        for prompt in prompts:
-                            if isinstance(prompt, dict):
-                                if "content" in prompt:
-                                    prompt_strings.append(str(prompt["content"]))
-                                elif "text" in prompt:
-                                    prompt_strings.append(str(prompt["text"]))
-                                else:
-                                    prompt_strings.append(str(prompt))
-                            else:
-                                prompt_strings.append(str(prompt))
-                        
                         for i, prompt in enumerate(prompt_strings, 1):
-                            # Create a row with the prompt text and copy button
-                            col1, col2 = st.columns([0.9, 0.1])
-                            with col1:
-                                st.markdown(f"{i}. {prompt}")
-                            with col2:
-                                if st.button("📋", key=f"url_copy_{i}", help=f"Copy prompt {i} to clipboard"):
-                                    copy_to_clipboard(prompt, f"url_prompt_{i}")
-                        
-                        # Copy all prompts button for URL analysis
-                        if st.button("📋 Copy All Prompts", key="url_copy_all_prompts", help="Copy all prompts to clipboard"):
-                            all_prompts_text = "\n\n".join(prompt_strings)
-                            copy_to_clipboard(all_prompts_text, "url_all_prompts")
+                            st.markdown(f"{i}. {prompt}")
                         
+                        # st.code ships its own copy button
                         st.markdown("**Code Block (copy all):**")
                         st.code("\n\n".join(prompt_strings), language="text")
                     else:
@@ -626,10 +633,3 @@ if analyze_url_btn and url_to_analyze:
                 url_progress_bar.progress(100)
                 url_status_text.text("❌ Error analyzing post.")
                 st.error(f"Error analyzing post: {e}")
-    
-    # Clear URL analysis progress after a short delay
-    import time
-    time.sleep(2)
-    url_progress_container.empty()
-    url_status_container.empty()
-
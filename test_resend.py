@@ -3,97 +3,44 @@
 Test Resend email functionality
 """
 
-import os
-from dotenv import load_dotenv
+import pytest
 
-# Load environment variables
-load_dotenv()
+from test_utils import get_resend_api_key, build_test_email
 
+@pytest.mark.xdist_group("resend-setup")
 def test_resend_setup():
     """Test Resend API setup and configuration"""
-    
+
     print("🧪 Testing Resend Setup...")
-    
-    # Check environment variable
-    resend_api_key = os.getenv("RESEND_API_KEY")
-    print(f"RESEND_API_KEY: {'✅ Set' if resend_api_key else '❌ Missing'}")
-    
-    if not resend_api_key:
-        print("❌ RESEND_API_KEY not found in environment variables")
-        return False
-    
-    try:
-        # Test Resend import
-        import resend
-        print("✅ Resend library imported successfully")
-        
-        # Set API key
-        resend.api_key = resend_api_key
-        print("✅ Resend API key set successfully")
-        
-        # Test sending a simple email
-        print("📧 Testing email send...")
-        
-        response = resend.Emails.send({
-            "from": "Acme <onboarding@resend.dev>",
-            "to": ["test@example.com"],  # This will fail but we can test the API
-            "subject": "Test Email - Reddit SaaS Idea Finder",
-            "html": "<h1>Test Email</h1><p>This is a test email to verify Resend integration.</p>"
-        })
-        
-        print(f"📊 Response: {response}")
-        print("✅ Resend API test completed successfully!")
-        return True
-        
-    except ImportError as e:
-        print(f"❌ Failed to import Resend: {e}")
-        print("💡 Run: pip install resend")
-        return False
-    except Exception as e:
-        print(f"❌ Resend error: {e}")
-        return False
 
+    if not get_resend_api_key():
+        pytest.skip("RESEND_API_KEY not set")
+
+    resend = pytest.importorskip("resend", reason="Run: pip install resend")
+    print("✅ Resend library imported successfully")
+
+    # Set API key
+    resend.api_key = get_resend_api_key()
+    print("✅ Resend API key set successfully")
+
+    # Resend's sandbox inbox accepts mail from the sandbox sender
+    print("📧 Testing email send...")
+    response = resend.Emails.send(build_test_email("delivered@resend.dev"))
+
+    print(f"📊 Response: {response}")
+    assert response, "Resend returned an empty response"
+
+@pytest.mark.xdist_group("resend-function")
 def test_fastapi_email_function():
     """Test the FastAPI email function"""
-    
+
     print("\n🧪 Testing FastAPI Email Function...")
-    
-    try:
-        # Import the FastAPI email function
-        import sys
-        import os
-        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-        
-        # We'll test the function signature and basic functionality
-        print("✅ FastAPI email function available")
-        
-        # Test with a dummy email (won't actually send)
-        print("📧 Testing email function with dummy data...")
-        
-        # This is just a test - we won't actually send an email
-        print("✅ Email function test completed")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error testing FastAPI email function: {e}")
-        return False
+
+    # We'll test the function signature and basic functionality
+    from fastapi_email_verification import send_verification_email_fastapi
+
+    assert callable(send_verification_email_fastapi)
+    print("✅ FastAPI email function available")
 
 if __name__ == "__main__":
-    print("🚀 Starting Resend Tests...")
-    print("=" * 50)
-    
-    # Test 1: Basic Resend setup
-    test1_passed = test_resend_setup()
-    
-    # Test 2: FastAPI email function
-    test2_passed = test_fastapi_email_function()
-    
-    print("\n" + "=" * 50)
-    print("📊 Test Results:")
-    print(f"Resend Setup: {'✅ PASSED' if test1_passed else '❌ FAILED'}")
-    print(f"FastAPI Email Function: {'✅ PASSED' if test2_passed else '❌ FAILED'}")
-    
-    if test1_passed and test2_passed:
-        print("\n🎉 All tests passed! Resend integration is working correctly.")
-    else:
-        print("\n⚠️ Some tests failed. Check the error messages above.") 
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__, "-s"]))
@@ -3,11 +3,7 @@
 Simple Resend test following the official documentation
 """
 
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from test_utils import get_resend_api_key
 
 def test_resend_simple():
     """Test Resend with the exact example from documentation"""
@@ -15,7 +11,7 @@ def test_resend_simple():
     print("🧪 Testing Resend Simple...")
     
     # Check environment variable
-    resend_api_key = os.getenv("RESEND_API_KEY")
+    resend_api_key = get_resend_api_key()
     print(f"RESEND_API_KEY: {'✅ Set' if resend_api_key else '❌ Missing'}")
     
     if not resend_api_key:
@@ -0,0 +1,47 @@
+"""
+Shared helpers for the email test scripts
+"""
+
+import os
+import sys
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+@lru_cache(maxsize=1)
+def get_resend_api_key():
+    """RESEND_API_KEY, loading .env on first use only (variables already set are kept)"""
+    load_dotenv()
+    return os.getenv("RESEND_API_KEY")
+
+def get_test_recipient() -> str:
+    """TEST_EMAIL_TO if set, else ask when run interactively, else Resend's sandbox inbox"""
+    recipient = os.getenv("TEST_EMAIL_TO")
+    if recipient:
+        return recipient
+    # Under pytest or CI stdin isn't a terminal, so input() would block forever
+    if sys.stdin.isatty():
+        return input("Enter your email address to test: ").strip()
+    return "delivered@resend.dev"
+
+TEST_EMAIL_HTML = """
+<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+    <h2 style="color: #333;">🧪 Test Email</h2>
+    <p>This is a test email to verify that the Resend integration is working correctly.</p>
+    <p>If you received this email, the email verification system is working!</p>
+    <div style="background-color: #d4edda; padding: 15px; border-radius: 6px; margin: 20px 0;">
+        <p style="margin: 0; color: #155724;">
+            ✅ <strong>Success!</strong> Email sending is working correctly.
+        </p>
+    </div>
+</div>
+"""
+
+def build_test_email(to: str) -> dict:
+    """Resend payload for the shared test email"""
+    return {
+        "from": "Acme <onboarding@resend.dev>",
+        "to": [to],
+        "subject": "Test Email - Reddit SaaS Idea Finder",
+        "html": TEST_EMAIL_HTML,
+    }